@@ -1,5 +1,11 @@
-import json
 import argparse
+import asyncio
+import collections
+import aiohttp
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+import lxml.html
+import orjson
+import requests
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -11,11 +17,33 @@ from webdriver_manager.chrome import ChromeDriverManager
 import time as pytime
 import re
 import os
+import shutil
+
+SEMESTER_PAGE_URL = "https://registration.bogazici.edu.tr/buis/general/schedule.aspx?p=semester"
+SEMESTER_FIELD = "ctl00$cphMainContent$ddlSemester"
+SEARCH_BUTTON_FIELD = "ctl00$cphMainContent$btnSearch"
+DEPARTMENT_LINK_XPATH = "//a[contains(@href, '/scripts/sch.asp?donem=')]"
+
+# Department pages are plain HTML, so they are fetched concurrently without a browser
+DEFAULT_WORKERS = 8
+MAX_CONNECTIONS = 16
+
+# Department pages rarely change within a semester, so re-runs are served from
+# a local SQLite cache. Server Cache-Control / ETag headers take precedence.
+CACHE_NAME = "boun_cache"
+CACHE_EXPIRE_AFTER = 3600  # seconds
 
 # --- Helper Functions for Parsing ---
 
+_DAYS_RE = re.compile(r'(Th|W|M|F|T|S)')
+_HOURS_RE = re.compile(r'(10|11|[1-9])')
+_DEPT_RE = re.compile(r"kisaadi=([A-Z]+)")
+
 def parse_credits(credit_str):
     """Safely parses a string into an integer for credits."""
+    # Empty cells are common; don't pay for a ValueError on them
+    if not credit_str:
+        return 0
     try:
         return int(credit_str)
     except (ValueError, TypeError):
@@ -23,6 +51,8 @@ def parse_credits(credit_str):
 
 def parse_ects(ects_str):
     """Safely parses a string into a float for ECTS."""
+    if not ects_str:
+        return 0.0
     try:
         return float(ects_str)
     except (ValueError, TypeError):
@@ -30,9 +60,9 @@ def parse_ects(ects_str):
 
 def parse_list_of_strings(s):
     """Splits a newline-separated string into a list of non-empty strings."""
-    if not s or not s.strip():
+    if not s:
         return []
-    return [item for item in s.strip().split('\n') if item]
+    return [item for item in s.splitlines() if item.strip()]
 
 def parse_days(days_str):
     """
@@ -41,8 +71,7 @@ def parse_days(days_str):
     if not days_str or not days_str.strip():
         return []
     # Match 'Th' and 'W', 'M', 'F', etc.
-    pattern = r'(Th|W|M|F|T|S)'
-    return re.findall(pattern, days_str.strip())
+    return _DAYS_RE.findall(days_str.strip())
 
 def parse_hours(hours_str):
     """
@@ -51,11 +80,38 @@ def parse_hours(hours_str):
     """
     if not hours_str or not hours_str.strip():
         return []
-    pattern = r'(10|11|[1-9])'
-    return re.findall(pattern, hours_str.strip())
+    return _HOURS_RE.findall(hours_str.strip())
 
 # --- WebDriver Setup ---
 
+# Driver binary paths that have started a browser, keyed by binary name
+_driver_paths = {}
+
+def _start_driver(start, binary, env_var, manager_cls):
+    """
+    Starts a WebDriver by calling start(driver_path). An explicit $env_var or a
+    binary on PATH is tried first, since webdriver-manager checks versions online
+    on every call. If that binary fails to start (e.g. it doesn't match the
+    installed browser), webdriver-manager is asked for a matching one.
+    Only a path that actually started a browser is cached.
+    """
+    if binary in _driver_paths:
+        return start(_driver_paths[binary])
+
+    local_path = os.environ.get(env_var) or shutil.which(binary)
+    if local_path:
+        try:
+            driver = start(local_path)
+            _driver_paths[binary] = local_path
+            return driver
+        except Exception as e:
+            print(f"{binary} at {local_path} could not be started, trying webdriver-manager: {e}")
+
+    path = manager_cls().install()
+    driver = start(path)
+    _driver_paths[binary] = path
+    return driver
+
 def get_webdriver(headless=False):
     """
     Tries to initialize Chrome WebDriver, falls back to Firefox if Chrome is unavailable.
@@ -65,9 +121,15 @@ def get_webdriver(headless=False):
     chrome_options = webdriver.ChromeOptions()
     if headless:
         chrome_options.add_argument('--headless')
+    # Only text is read from the pages: skip images and don't wait for subresources.
+    # Stylesheets stay on, since the loading-overlay wait depends on element visibility.
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    chrome_options.page_load_strategy = 'eager'
     try:
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = _start_driver(
+            lambda path: webdriver.Chrome(service=ChromeService(executable_path=path), options=chrome_options),
+            "chromedriver", "CHROMEDRIVER", ChromeDriverManager,
+        )
         print("Using Chrome WebDriver.")
         return driver, "chrome"
     except Exception as e:
@@ -77,9 +139,14 @@ def get_webdriver(headless=False):
     firefox_options = webdriver.FirefoxOptions()
     if headless:
         firefox_options.add_argument('-headless')
+    firefox_options.set_preference("permissions.default.image", 2)
+    firefox_options.set_preference("gfx.downloadable_fonts.enabled", False)
+    firefox_options.page_load_strategy = 'eager'
     try:
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=firefox_options)
+        driver = _start_driver(
+            lambda path: webdriver.Firefox(service=FirefoxService(executable_path=path), options=firefox_options),
+            "geckodriver", "GECKODRIVER", GeckoDriverManager,
+        )
         print("Using Firefox WebDriver.")
         return driver, "firefox"
     except Exception as e:
@@ -88,190 +155,307 @@ def get_webdriver(headless=False):
     print("Neither Chrome nor Firefox WebDriver could be initialized.")
     return None, None
 
-# --- Main Scraping Logic ---
+# --- Department Page Parsing ---
+
+# lxml's text_content() ignores <br>, while Selenium's .text renders it as a
+# newline. Mark line breaks with a sentinel so source-formatting newlines can
+# still be collapsed like ordinary whitespace.
+_LINE_BREAK = "\ue000"  # Unicode private-use code point, never in real page text
+
+def _cell_text(cell):
+    """
+    Returns the text of a table cell the way a browser renders it:
+    whitespace collapsed, one line per <br>-separated chunk.
+    """
+    lines = (" ".join(part.split()) for part in cell.text_content().split(_LINE_BREAK))
+    return "\n".join(line for line in lines if line)
 
-def scrape_boun_schedule(semester, headless=False):
+def parse_department(html, url, encoding=None):
     """
-    Scrapes the course schedule for a given semester from the BOUN registration site.
+    Parses a department schedule page, given as the raw response bytes,
+    into a dict of course sections keyed by course code.
+    `encoding` is the charset from the HTTP header, if any; without it
+    lxml falls back to the page's <meta> charset.
     """
-    driver, browser_name = get_webdriver(headless)
-    if not driver:
-        print("Please ensure you have Chrome or Firefox and their drivers installed.")
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    tree = lxml.html.fromstring(html, parser=parser)
+    tables = tree.xpath("//table[@border='1']")
+    if not tables:
+        print(f"Skipping department {url} (no table found).")
         return {}
 
+    for br in tree.iter("br"):
+        br.tail = _LINE_BREAK + (br.tail or "")
+
+    rows = tables[0].xpath("(.//tr)[position()>1]")  # Skip header row
+
+    dept_code_match = _DEPT_RE.search(url)
+    dept_code = dept_code_match.group(1) if dept_code_match else "UNKNOWN"
+    print(f"Scraping department: {dept_code} - {len(rows)} lessons found.")
+
     results = {}
-    base_url = "https://registration.bogazici.edu.tr/buis/general/"
-    
-    try:
-        driver.get(base_url + "schedule.aspx?p=semester")
-        wait = WebDriverWait(driver, 30)
+    last_course_key = None
 
-        # Wait for loading overlay to disappear before interacting
-        wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "grec-loading-container")))
+    for row in rows:
+        cols = row.xpath("./td")
 
-        # Select the semester
-        select = Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_cphMainContent_ddlSemester"))))
-        select.select_by_value(semester)
-        
-        # Click the search button
-        wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "grec-loading-container")))
-        driver.find_element(By.ID, "ctl00_cphMainContent_btnSearch").click()
-
-        # Get all department links
-        department_links_elements = wait.until(EC.presence_of_all_elements_located(
-            (By.XPATH, "//a[contains(@href, '/scripts/sch.asp?donem=')]")
-        ))
-        department_urls = [link.get_attribute('href') for link in department_links_elements]
-
-        print(f"Found {len(department_urls)} department schedules to scrape.")
-
-        last_course_key = None
-
-        for url in department_urls:
-            driver.get(url)
-            try:
-                # Wait up to 5 seconds for the table to appear, else skip
-                try:
-                    table = WebDriverWait(driver, 3).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "table[border='1']"))
-                    )
-                except Exception:
-                    print(f"Skipping department {url} (no table found after 3 seconds).")
-                    continue
-
-                rows = table.find_elements(By.TAG_NAME, "tr")[1:]  # Skip header row
-                
-                dept_code_match = re.search(r"kisaadi=([A-Z]+)", url)
-                dept_code = dept_code_match.group(1) if dept_code_match else "UNKNOWN"
-                print(f"Scraping department: {dept_code} - {len(rows)} lessons found.")
-
-                for row in rows:
-                    cols = [td for td in row.find_elements(By.TAG_NAME, "td")]
-                    
-                    if len(cols) < 10:
-                        continue
-                    
-                    course_code_raw = cols[0].text.strip()
-
-                    # Handle multi-line course entries
-                    if not course_code_raw and last_course_key and last_course_key in results:
-                        # Days, Hours, Rooms handling for multi-line
-                        if cols[7].text.strip():
-                            results[last_course_key]["days"].extend(parse_days(cols[7].text))
-                        if cols[8].text.strip():
-                            results[last_course_key]["hours"].extend(parse_hours(cols[8].text))
-                        # Rooms logic
-                        room_cell = cols[9]
-                        room_text = room_cell.text.strip()
-                        # Check for "Online" in the cell
-                        if "Online" in room_text:
-                            results[last_course_key]["rooms"].extend(["Online"])
-                        elif room_text:
-                            results[last_course_key]["rooms"].extend(parse_list_of_strings(room_text))
-                        else:
-                            # Try to extract from <span> tags if present
-                            spans = room_cell.find_elements(By.TAG_NAME, "span")
-                            if spans:
-                                results[last_course_key]["rooms"].extend([span.text.strip() for span in spans if span.text.strip()])
-                        continue
-
-                    if not course_code_raw:
-                        continue
-
-                    # This is a new course entry
-                    course_name_raw = cols[2].text.strip()
-                    section_part = cols[1].text.strip().replace(" ", "")
-                    unique_key = course_code_raw.replace(" ", "")
-
-                    # Create a more unique key for labs/ps to avoid overwriting
-                    if "LAB" in course_name_raw.upper() or "P.S." in course_name_raw.upper():
-                        if section_part:
-                            unique_key = f"{unique_key}.{section_part}"
-
-                    last_course_key = unique_key
-                    
-                    course_data = {
-                        "code": course_code_raw,
-                        "name": course_name_raw,
-                        "credits": parse_credits(cols[3].text.strip()),
-                        "ects": parse_ects(cols[4].text.strip()),
-                        "instructor": cols[6].text.strip(),
-                    }
-
-                    # Add optional fields only if they contain data
-                    if cols[5].text.strip():
-                        course_data["requiredForDept"] = parse_list_of_strings(cols[5].text)
-                    if cols[7].text.strip():
-                        course_data["days"] = parse_days(cols[7].text)
-                    if cols[8].text.strip():
-                        course_data["hours"] = parse_hours(cols[8].text)
-                    
-                    # Rooms logic
-                    room_cell = cols[9]
-                    room_text = room_cell.text.strip()
-                    if "Online" in room_text:
-                        course_data["rooms"] = ["Online"]
-                    elif room_text:
-                        course_data["rooms"] = parse_list_of_strings(room_text)
-                    else:
-                        # Try to extract from <span> tags if present
-                        spans = room_cell.find_elements(By.TAG_NAME, "span")
-                        if spans:
-                            course_data["rooms"] = [span.text.strip() for span in spans if span.text.strip()]
-                        else:
-                            course_data["rooms"] = ["N/A"]
-                    
-                    results[unique_key] = course_data
-            
-            except Exception as e:
-                print(f"Could not process department {dept_code}. Error: {e}")
+        if len(cols) < 10:
+            continue
+
+        course_code_raw = _cell_text(cols[0])
+
+        # Handle multi-line course entries
+        if not course_code_raw:
+            entry = results.get(last_course_key)
+            if entry is None:
                 continue
-    
-    finally:
-        driver.quit()
+            # Days, Hours, Rooms handling for multi-line
+            days_text = _cell_text(cols[7])
+            hours_text = _cell_text(cols[8])
+            # The first line may have had no days/hours, so the lists might not exist yet
+            if days_text:
+                entry.setdefault("days", []).extend(parse_days(days_text))
+            if hours_text:
+                entry.setdefault("hours", []).extend(parse_hours(hours_text))
+            # Rooms logic
+            rooms = entry["rooms"]
+            room_cell = cols[9]
+            room_text = _cell_text(room_cell)
+            # Check for "Online" in the cell
+            if "Online" in room_text:
+                rooms.append("Online")
+            elif room_text:
+                rooms.extend(parse_list_of_strings(room_text))
+            else:
+                # Try to extract from <span> tags if present
+                spans = room_cell.xpath(".//span")
+                if spans:
+                    rooms.extend([text for text in map(_cell_text, spans) if text])
+            continue
+
+        # This is a new course entry
+        course_name_raw = _cell_text(cols[2])
+        section_part = _cell_text(cols[1]).replace(" ", "")
+        unique_key = course_code_raw.replace(" ", "")
+
+        # Create a more unique key for labs/ps to avoid overwriting
+        if "LAB" in course_name_raw.upper() or "P.S." in course_name_raw.upper():
+            if section_part:
+                unique_key = f"{unique_key}.{section_part}"
+
+        last_course_key = unique_key
+
+        course_data = {
+            "code": course_code_raw,
+            "name": course_name_raw,
+            "credits": parse_credits(_cell_text(cols[3])),
+            "ects": parse_ects(_cell_text(cols[4])),
+            "instructor": _cell_text(cols[6]),
+        }
+
+        # Add optional fields only if they contain data
+        required_text = _cell_text(cols[5])
+        days_text = _cell_text(cols[7])
+        hours_text = _cell_text(cols[8])
+        if required_text:
+            course_data["requiredForDept"] = parse_list_of_strings(required_text)
+        if days_text:
+            course_data["days"] = parse_days(days_text)
+        if hours_text:
+            course_data["hours"] = parse_hours(hours_text)
+
+        # Rooms logic
+        room_cell = cols[9]
+        room_text = _cell_text(room_cell)
+        if "Online" in room_text:
+            course_data["rooms"] = ["Online"]
+        elif room_text:
+            course_data["rooms"] = parse_list_of_strings(room_text)
+        else:
+            # Try to extract from <span> tags if present
+            spans = room_cell.xpath(".//span")
+            if spans:
+                course_data["rooms"] = [text for text in map(_cell_text, spans) if text]
+            else:
+                course_data["rooms"] = ["N/A"]
+
+        results[unique_key] = course_data
 
     return results
 
-def save_json(data, semester):
+async def fetch_department(session, semaphore, url):
+    """
+    Downloads and parses a single department schedule page.
+    Returns an empty dict if the page could not be fetched or parsed.
+    """
+    try:
+        async with semaphore:
+            async with session.get(url) as r:
+                r.raise_for_status()
+                # Keep raw bytes: the header charset is used when sent, otherwise
+                # lxml reads the page's <meta> charset (e.g. windows-1254)
+                html = await r.read()
+                encoding = r.charset
+        # Parse in a worker thread so the event loop keeps downloading other pages meanwhile
+        return await asyncio.to_thread(parse_department, html, url, encoding)
+    except Exception as e:
+        print(f"Could not process department {url}. Error: {e}")
+        return {}
+
+async def gather_all(urls, out, workers=DEFAULT_WORKERS, use_cache=True):
+    """
+    Fetches all department schedule pages concurrently, at most `workers` at a time,
+    and appends every course to `out` as one JSON line. Returns the number of lines written.
+    """
+    semaphore = asyncio.Semaphore(workers)
+    connector = aiohttp.TCPConnector(limit=max(workers, MAX_CONNECTIONS))
+    if use_cache:
+        cache = SQLiteBackend(CACHE_NAME, expire_after=CACHE_EXPIRE_AFTER, cache_control=True)
+        session = CachedSession(cache=cache, connector=connector)
+    else:
+        session = aiohttp.ClientSession(connector=connector)
+    written = 0
+
+    def write_department(department):
+        for unique_key, course_data in department.items():
+            out.write(orjson.dumps({unique_key: course_data}) + b"\n")
+        out.flush()
+        return len(department)
+
+    async with session:
+        # Departments are written in link order so duplicate keys resolve the same way on
+        # every run. At most 2 * workers departments are scheduled ahead of the one being
+        # written, so a slow page holds back only that many finished results, and each
+        # task is popped (dropping its result) once written.
+        pending = collections.deque()
+        for url in urls:
+            pending.append(asyncio.ensure_future(fetch_department(session, semaphore, url)))
+            if len(pending) >= 2 * workers:
+                written += write_department(await pending.popleft())
+        while pending:
+            written += write_department(await pending.popleft())
+    return written
+
+# --- Semester Form ---
+
+def _fetch_semester_page(session):
+    """Downloads the semester selection page and returns it as an lxml tree."""
+    r = session.get(SEMESTER_PAGE_URL, timeout=30)
+    r.raise_for_status()
+    return lxml.html.fromstring(r.text, base_url=r.url)
+
+def _parse_semesters(tree):
+    """Returns the non-empty option values of the semester dropdown."""
+    return [value for value in tree.xpath("//select[@name=$name]/option/@value", name=SEMESTER_FIELD) if value]
+
+def _parse_department_urls(tree):
+    """Returns the absolute URLs of all department schedule links on a search result page."""
+    tree.make_links_absolute()
+    return tree.xpath(DEPARTMENT_LINK_XPATH + "/@href")
+
+def fetch_semesters_from_website(session):
+    """
+    Fetches the list of available semesters from the website.
+    """
+    return _parse_semesters(_fetch_semester_page(session))
+
+def fetch_department_urls(session, semester):
     """
-    Saves the scraped data to a JSON file in the 'data' folder, sorted alphabetically by course code.
+    Submits the ASP.NET semester form directly, without a browser, and
+    returns the department schedule URLs for the chosen semester.
     """
+    tree = _fetch_semester_page(session)
+    form = tree.forms[0]
+
+    # form_values() carries the hidden __VIEWSTATE / __EVENTVALIDATION fields
+    fields = dict(form.form_values())
+    fields[SEMESTER_FIELD] = semester
+    fields[SEARCH_BUTTON_FIELD] = "Search"
+
+    r = session.post(form.action or SEMESTER_PAGE_URL, data=fields, timeout=30)
+    r.raise_for_status()
+    return _parse_department_urls(lxml.html.fromstring(r.text, base_url=r.url))
+
+def _browser_page_tree(driver):
+    """
+    Parses the browser's current page with lxml, so it can be traversed
+    in-process instead of with one WebDriver round trip per element.
+    """
+    return lxml.html.fromstring(driver.page_source, base_url=driver.current_url)
+
+def fetch_semesters_with_browser(driver):
+    """
+    Fetches the list of available semesters by loading the page in a browser.
+    """
+    driver.get(SEMESTER_PAGE_URL)
+    return _parse_semesters(_browser_page_tree(driver))
+
+def fetch_department_urls_with_browser(driver, semester):
+    """
+    Drives the semester form in a browser and returns the department schedule URLs.
+    Slower than fetch_department_urls, but works if the form ever requires JavaScript.
+    """
+    driver.get(SEMESTER_PAGE_URL)
+    wait = WebDriverWait(driver, 30)
+
+    # Wait for loading overlay to disappear before interacting
+    wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "grec-loading-container")))
+
+    # Select the semester
+    select = Select(wait.until(EC.presence_of_element_located((By.ID, "ctl00_cphMainContent_ddlSemester"))))
+    select.select_by_value(semester)
+    
+    # Click the search button
+    wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "grec-loading-container")))
+    driver.find_element(By.ID, "ctl00_cphMainContent_btnSearch").click()
+
+    # Wait for the first department link, then read them all from the page source.
+    # Waiting on a single element avoids serializing a handle for every link on each poll.
+    wait.until(EC.presence_of_element_located((By.XPATH, DEPARTMENT_LINK_XPATH)))
+    return _parse_department_urls(_browser_page_tree(driver))
+
+# --- Main Scraping Logic ---
+
+def scrape_boun_schedule(department_urls, out, workers=DEFAULT_WORKERS, use_cache=True):
+    """
+    Scrapes the course schedules of the given department pages, streaming
+    each course to the binary file `out` in JSON Lines format.
+    Returns the number of lines written; a course listed by several
+    departments is counted once per department.
+    """
+    print(f"Found {len(department_urls)} department schedules to scrape.")
+
+    return asyncio.run(gather_all(department_urls, out, workers, use_cache))
+
+def data_filename(semester, extension):
+    """Returns the path of a semester's output file in the 'data' folder."""
+    return os.path.join("data", f"{semester.replace('/', '-')}.{extension}")
+
+def save_json(semester):
+    """
+    Builds the semester's JSON file in the 'data' folder from its streamed
+    .jsonl results, sorted alphabetically by course code.
+    """
+    data = {}
+    with open(data_filename(semester, "jsonl"), 'rb') as f:
+        for line in f:
+            data.update(orjson.loads(line))
+
     if not data:
         print("No data was scraped. JSON file will not be created.")
         return
 
-    # Ensure the 'data' directory exists
-    os.makedirs("data", exist_ok=True)
-    filename = os.path.join("data", f"{semester.replace('/', '-')}.json")
+    filename = data_filename(semester, "json")
 
-    # Sort the dictionary by its keys (course codes) before saving
+    # Sort the dictionary by its keys (course codes) before saving. Only the top
+    # level is sorted, so each course keeps its field order.
     sorted_data = dict(sorted(data.items()))
 
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(sorted_data, f, ensure_ascii=False, indent=4)
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(sorted_data, option=orjson.OPT_INDENT_2))
 
     print(f"\nSuccessfully saved {len(data)} course sections to {filename}")
 
-def fetch_semesters_from_website(headless=False):
-    """
-    Fetches the list of available semesters from the website.
-    """
-    driver, browser_name = get_webdriver(headless)
-    if not driver:
-        print("Please ensure you have Chrome or Firefox and their drivers installed.")
-        return []
-        
-    semesters = []
-    try:
-        driver.get("https://registration.bogazici.edu.tr/buis/general/schedule.aspx?p=semester")
-        select = Select(driver.find_element(By.ID, "ctl00_cphMainContent_ddlSemester"))
-        for option in select.options:
-            if option.get_attribute("value"):
-                semesters.append(option.get_attribute("value"))
-    finally:
-        driver.quit()
-    return semesters
-
 def prompt_semester(semesters):
     """
     Prompts the user to select a semester from the available list.
@@ -300,19 +484,48 @@ def prompt_semester(semesters):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Scrape BOUN course schedule to a structured JSON file.")
-    parser.add_argument('--nogui', action='store_true', help="Run in headless mode (no browser GUI).")
+    parser.add_argument('--browser', action='store_true', help="Drive a real browser through the semester form instead of posting it directly.")
+    parser.add_argument('--nogui', action='store_true', help="Run the browser in headless mode (no browser GUI). Only used with --browser.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f"Number of department pages to download in parallel (default: {DEFAULT_WORKERS}).")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-download department pages instead of using the local cache.")
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
-    # Step 1: Get the list of semesters
-    semesters = fetch_semesters_from_website(headless=args.nogui)
-    
-    # Step 2: Have the user choose one
-    selected_semester = prompt_semester(semesters)
-    
-    if selected_semester:
-        # Step 3: Scrape the data for the chosen semester
-        print(f"\nStarting to scrape data for semester: {selected_semester}...")
-        data = scrape_boun_schedule(selected_semester, headless=args.nogui)
+    driver = None
+    if args.browser:
+        driver, _ = get_webdriver(headless=args.nogui)
+        if not driver:
+            print("Please ensure you have Chrome or Firefox and their drivers installed.")
+            raise SystemExit(1)
+    session = requests.Session()
+
+    try:
+        # Step 1: Get the list of semesters
+        if driver:
+            semesters = fetch_semesters_with_browser(driver)
+        else:
+            semesters = fetch_semesters_from_website(session)
+        
+        # Step 2: Have the user choose one
+        selected_semester = prompt_semester(semesters)
         
-        # Step 4: Save the data to a JSON file
-        save_json(data, selected_semester)
\ No newline at end of file
+        if selected_semester:
+            # Step 3: Scrape the data for the chosen semester
+            print(f"\nStarting to scrape data for semester: {selected_semester}...")
+            if driver:
+                department_urls = fetch_department_urls_with_browser(driver, selected_semester)
+            else:
+                department_urls = fetch_department_urls(session, selected_semester)
+            # Courses are streamed to a .jsonl file as they are parsed, so a
+            # crashed run still leaves its partial results behind
+            os.makedirs("data", exist_ok=True)
+            with open(data_filename(selected_semester, "jsonl"), 'wb') as out:
+                scrape_boun_schedule(department_urls, out, workers=args.workers, use_cache=not args.no_cache)
+            
+            # Step 4: Save the data to a JSON file
+            save_json(selected_semester)
+    finally:
+        session.close()
+        if driver:
+            driver.quit()